@@ -4,21 +4,97 @@ Job Post Workflow - Automated job posting creation and distribution
 Creates job posts, sends email notifications, and posts to LinkedIn/Facebook
 """
 
+import copy
+import functools
 import json
 import os
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Optional
 
 # Try to import requests, provide helpful message if missing
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 except ImportError:
     print("Note: 'requests' library not installed. Social posting will be limited.")
     requests = None
 
+# (connect, read) timeout in seconds for social API calls
+HTTP_TIMEOUT = (5, 30)
+
+# Longest Retry-After (seconds) we wait for before retrying a throttled post
+RETRY_AFTER_MAX_SECONDS = 30
+
+# LinkedIn UGC Post API
+LINKEDIN_UGC_POSTS_URL = "https://api.linkedin.com/v2/ugcPosts"
+
+# Headers shared by every LinkedIn call; Authorization is added per call
+LINKEDIN_HEADERS = {
+    "Content-Type": "application/json",
+    "X-Restli-Protocol-Version": "2.0.0"
+}
+
+# Job post layout; bullet blocks are pre-rendered with a trailing newline per item
+JOB_POST_TEMPLATE = (
+    "🚀 {job_title} at {company_name}\n"
+    "\n"
+    "📍 Location: {location}\n"
+    "💼 Type: {employment_type}\n"
+    "💰 Salary: {salary_range}\n"
+    "\n"
+    + "─" * 50 + "\n"
+    "\n"
+    "About the Role:\n"
+    "{description}\n"
+    "\n"
+    "Key Responsibilities:\n"
+    "{responsibilities_block}"
+    "\n"
+    "Requirements:\n"
+    "{requirements_block}"
+    "\n"
+    "What We Offer:\n"
+    "{benefits_block}"
+    "\n"
+    + "─" * 50 + "\n"
+    "\n"
+    "📧 Apply: {application_url}\n"
+    "\n"
+    "#hiring #{company_tag} #job"
+)
+
+# orjson is optional - faster config parsing, falls back to the json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+DEFAULT_CONFIG = {
+    "email": {
+        "method": "console",
+        "sender_email": "",
+        "recipient_email": ""
+    },
+    "linkedin": {
+        "access_token": "",
+        "person_urn": ""
+    },
+    "facebook": {
+        "page_id": "",
+        "page_access_token": ""
+    }
+}
+
+
+@functools.lru_cache(maxsize=8)
+def _read_config_file(path: str, mtime_ns: int) -> Dict:
+    """Parse a config file; cached per path until its mtime changes"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
 
 class JobPostWorkflow:
     """Main workflow class for creating and distributing job posts"""
@@ -31,38 +107,53 @@ class JobPostWorkflow:
         self.config_path = config_path
         self.config = self._load_config()
         self.job_data = {}
+        self._http = self._create_http_session() if requests is not None else None
 
     def _load_config(self) -> Dict:
         """Load configuration from file or return defaults"""
-        if os.path.exists(self.config_path):
-            try:
-                with open(self.config_path, 'r') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                print(f"Warning: Invalid config.json in {self.config_path}")
-                return self._default_config()
-        else:
+        try:
+            # One stat both checks the file exists and keys the parse cache
+            mtime_ns = os.stat(self.config_path).st_mtime_ns
+            # Copy so one workflow can't modify another's config
+            return copy.deepcopy(_read_config_file(self.config_path, mtime_ns))
+        except FileNotFoundError:
             print(f"Config file not found at {self.config_path}")
             print("Using default configuration. Please create config.json for full functionality.")
             return self._default_config()
+        except json.JSONDecodeError:
+            print(f"Warning: Invalid config.json in {self.config_path}")
+            return self._default_config()
+
+    def _create_http_session(self):
+        """Create a keep-alive HTTP session shared by the social posting calls"""
+        # POST is not idempotent: only retry when the connection was never
+        # made, or the API itself rejected the call with 429/503. A 502/504
+        # comes from a gateway - the post may already be published upstream,
+        # so retrying could publish it twice. Once retries run out, the last
+        # response is returned (not raised) so its status and body get printed.
+        retry_options = dict(
+            total=3,
+            read=0,
+            backoff_factor=0.5,
+            status_forcelist=[429, 503],
+            allowed_methods=frozenset({"POST"}),
+            raise_on_status=False,
+        )
+        try:
+            # Honour Retry-After, but never block the CLI for longer than this
+            retry = Retry(retry_after_max=RETRY_AFTER_MAX_SECONDS, **retry_options)
+        except TypeError:
+            # Older urllib3 can't cap Retry-After - fall back to plain backoff
+            retry = Retry(respect_retry_after_header=False, **retry_options)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry)
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        return session
 
     def _default_config(self) -> Dict:
         """Return default configuration"""
-        return {
-            "email": {
-                "method": "console",
-                "sender_email": "",
-                "recipient_email": ""
-            },
-            "linkedin": {
-                "access_token": "",
-                "person_urn": ""
-            },
-            "facebook": {
-                "page_id": "",
-                "page_access_token": ""
-            }
-        }
+        return copy.deepcopy(DEFAULT_CONFIG)
 
     def gather_job_details(self) -> Dict:
         """Interactive prompt to gather job details"""
@@ -115,51 +206,18 @@ class JobPostWorkflow:
         if not job_data:
             raise ValueError("No job data available. Run gather_job_details() first.")
 
-        # Build the job post
-        post_lines = [
-            f"🚀 {job_data['job_title']} at {job_data['company_name']}",
-            "",
-            f"📍 Location: {job_data['location']}",
-            f"💼 Type: {job_data['employment_type']}",
-            f"💰 Salary: {job_data['salary_range']}",
-            "",
-            "─" * 50,
-            "",
-            "About the Role:",
-            job_data.get('description', 'Join our team!'),
-            "",
-            "Key Responsibilities:",
-        ]
-
-        for resp in job_data.get('responsibilities', []):
-            post_lines.append(f"  • {resp}")
-
-        post_lines.extend([
-            "",
-            "Requirements:",
-        ])
-
-        for req in job_data.get('requirements', []):
-            post_lines.append(f"  • {req}")
-
-        post_lines.extend([
-            "",
-            "What We Offer:",
-        ])
-
-        for benefit in job_data.get('benefits', []):
-            post_lines.append(f"  ✓ {benefit}")
-
-        post_lines.extend([
-            "",
-            "─" * 50,
-            "",
-            f"📧 Apply: {job_data.get('application_url', 'Contact us for details')}",
-            "",
-            f"#hiring #{job_data['company_name'].replace(' ', '')} #job",
-        ])
-
-        return "\n".join(post_lines)
+        # Pre-render the bullet sections; the rest is filled in by the template
+        fields = {
+            **job_data,
+            "description": job_data.get('description', 'Join our team!'),
+            "application_url": job_data.get('application_url', 'Contact us for details'),
+            "company_tag": job_data['company_name'].replace(' ', ''),
+            "responsibilities_block": "".join(f"  • {resp}\n" for resp in job_data.get('responsibilities', ())),
+            "requirements_block": "".join(f"  • {req}\n" for req in job_data.get('requirements', ())),
+            "benefits_block": "".join(f"  ✓ {benefit}\n" for benefit in job_data.get('benefits', ())),
+        }
+
+        return JOB_POST_TEMPLATE.format_map(fields)
 
     def send_email_notification(self, job_post: str, job_data: Dict = None) -> bool:
         """Send email with the job post for review"""
@@ -188,6 +246,11 @@ class JobPostWorkflow:
 
     def _send_via_gmail_smtp(self, subject: str, body: str, config: Dict) -> bool:
         """Send email using Gmail SMTP"""
+        # Only needed on this path - keep them out of the startup imports
+        import smtplib
+        from email.mime.text import MIMEText
+        from email.mime.multipart import MIMEMultipart
+
         try:
             sender_email = config.get('sender_email')
             app_password = config.get('app_password')
@@ -255,28 +318,20 @@ class JobPostWorkflow:
             return False
 
         try:
-            # LinkedIn UGC Post API
-            url = "https://api.linkedin.com/v2/ugcPosts"
-
             person_urn = linkedin_config.get('person_urn', '')
             if not person_urn:
                 print("✗ LinkedIn person URN not configured")
                 return False
 
-            headers = {
-                "Authorization": f"Bearer {access_token}",
-                "Content-Type": "application/json",
-                "X-Restli-Protocol-Version": "2.0.0"
-            }
-
+            # Built per call from the credentials checked above - nothing shared
+            # between the concurrent posting threads
+            headers = {**LINKEDIN_HEADERS, "Authorization": f"Bearer {access_token}"}
             payload = {
                 "author": person_urn,
                 "lifecycleState": "PUBLISHED",
                 "specificContent": {
                     "com.linkedin.ugc.ShareContent": {
-                        "shareCommentary": {
-                            "text": job_post
-                        },
+                        "shareCommentary": {"text": job_post},
                         "shareMediaCategory": "NONE"
                     }
                 },
@@ -285,7 +340,12 @@ class JobPostWorkflow:
                 }
             }
 
-            response = requests.post(url, headers=headers, json=payload)
+            response = self._http.post(
+                LINKEDIN_UGC_POSTS_URL,
+                headers=headers,
+                json=payload,
+                timeout=HTTP_TIMEOUT
+            )
 
             if response.status_code in [200, 201]:
                 print("✓ Successfully posted to LinkedIn!")
@@ -315,13 +375,13 @@ class JobPostWorkflow:
             return False
 
         try:
-            url = f"https://graph.facebook.com/{page_id}/feed"
             params = {
                 "message": job_post,
                 "access_token": page_access_token
             }
 
-            response = requests.post(url, params=params)
+            url = f"https://graph.facebook.com/{page_id}/feed"
+            response = self._http.post(url, params=params, timeout=HTTP_TIMEOUT)
 
             if response.status_code in [200, 201]:
                 print("✓ Successfully posted to Facebook!")
@@ -363,8 +423,12 @@ class JobPostWorkflow:
         elif choice == '2':
             self.post_to_facebook(job_post)
         elif choice == '3':
-            linkedin_ok = self.post_to_linkedin(job_post)
-            facebook_ok = self.post_to_facebook(job_post)
+            # Independent network calls - post to both platforms at the same time
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                linkedin_future = executor.submit(self.post_to_linkedin, job_post)
+                facebook_future = executor.submit(self.post_to_facebook, job_post)
+                linkedin_ok = linkedin_future.result()
+                facebook_ok = facebook_future.result()
             if linkedin_ok and facebook_ok:
                 print("\n✓ Job post successfully published to both platforms!")
         elif choice == '4':
@@ -385,8 +449,11 @@ class JobPostWorkflow:
         filepath = os.path.join(os.path.dirname(__file__), filename)
 
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(job_post)
+            # Encode once and write bytes - skips the text layer's incremental encoder.
+            # Keep the platform line endings text mode used to produce (CRLF on Windows)
+            data = job_post.replace('\n', os.linesep).encode('utf-8')
+            with open(filepath, 'wb') as f:
+                f.write(data)
             print(f"📄 Job post saved to: {filename}")
         except Exception as e:
             print(f"Note: Could not save job post file: {e}")
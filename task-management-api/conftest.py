@@ -6,33 +6,61 @@ This file provides test fixtures and utilities for testing the FastAPI applicati
 from typing import Generator
 from datetime import datetime
 from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 
 import pytest
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
 from sqlmodel import SQLModel, create_engine, Session
 
+# Import the app and models once at collection time; this also registers
+# the models with SQLModel.metadata
+import main
+
 # Test database URL (using SQLite for tests)
-# Using file::memory: with cache=shared to allow multiple connections to the same in-memory DB
-TEST_DATABASE_URL = "sqlite:///file:test_db?mode=memory&cache=shared"
+# In-memory database; StaticPool keeps a single connection so every session sees it.
+# Each pytest-xdist worker is its own process, so workers never share a database.
+TEST_DATABASE_URL = "sqlite://"
 
+# Nothing needs to survive the test run, so skip syncing and journaling to disk
+SQLITE_TEST_PRAGMAS = (
+    "PRAGMA synchronous=OFF",
+    "PRAGMA journal_mode=MEMORY",
+    "PRAGMA locking_mode=EXCLUSIVE",
+    "PRAGMA temp_store=MEMORY",
+)
 
-@pytest.fixture(scope="function")
-def test_engine():
-    """Create a test database engine."""
-    # Import models first to register them with SQLModel.metadata
-    from main import Task, TaskStatus, TaskPriority
 
+@pytest.fixture(scope="session")
+def test_engine():
+    """Create the test database engine and schema once per test run."""
     engine = create_engine(
         TEST_DATABASE_URL,
         echo=False,
-        connect_args={"check_same_thread": False}
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
     )
 
-    # Create tables in the test database
+    # pysqlite starts and commits transactions on its own, which breaks
+    # SAVEPOINT-based rollback. Let SQLAlchemy emit BEGIN itself instead.
+    @event.listens_for(engine, "connect")
+    def _configure_sqlite(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for pragma in SQLITE_TEST_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    # Create tables in the test database (migrations are for real databases)
     SQLModel.metadata.create_all(engine)
 
     yield engine
 
-    # Drop tables after test
+    # Drop tables after the test run
     SQLModel.metadata.drop_all(engine)
 
     engine.dispose()
@@ -40,30 +68,69 @@ def test_engine():
 
 @pytest.fixture(scope="function")
 def test_session(test_engine) -> Generator[Session, None, None]:
-    """Create a test database session."""
-    with Session(test_engine) as session:
-        yield session
+    """
+    Create a test database session inside a transaction that is rolled back.
 
+    Commits made by the endpoints only release a SAVEPOINT, so every test
+    starts with an empty database without recreating the tables.
 
-@pytest.fixture(scope="function")
-def test_client(test_session):
-    """Create a test client with database session override."""
-    from main import app, get_session
+    Every commit also marks the app's cached stats stale, so helpers that
+    write straight to the database never leave /tasks/stats outdated.
+    """
+    with test_engine.connect() as connection:
+        transaction = connection.begin()
+        with Session(bind=connection, join_transaction_mode="create_savepoint") as session:
+            event.listen(session, "after_commit", lambda session: main.invalidate_stats_cache())
+            yield session
+        transaction.rollback()
+
+
+@pytest.fixture(scope="session")
+def app():
+    """The FastAPI application, imported once for the whole test run."""
+    return main.app
 
+
+@pytest.fixture(scope="session")
+def app_client(app) -> TestClient:
+    """
+    Create a single test client shared by the whole test run.
+
+    The app has no startup work (the schema comes from Alembic migrations),
+    so it is not entered as a context manager.
+    """
+    return TestClient(app)
+
+
+@pytest.fixture(scope="function")
+def session_override(app, test_session):
+    """Point the app's database dependency at this test's session."""
     # Override the database dependency
-    def override_get_session():
-        yield test_session
+    app.dependency_overrides[main.get_session] = lambda: test_session
 
-    app.dependency_overrides[get_session] = override_get_session
+    # The previous test's data was rolled back behind the app's back
+    main.invalidate_stats_cache()
 
-    # Create test client (using synchronous client for synchronous app)
-    client = TestClient(app)
-    yield client
+    yield
 
     # Clean up overrides
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(scope="function")
+def test_client(app_client, session_override):
+    """Shared test client with the database session overridden for this test."""
+    return app_client
+
+
+@pytest.fixture(scope="function")
+async def async_client(app, session_override):
+    """Async client calling the app in-process, for `async def` tests."""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
 # =============================================================================
 # Helper Functions for Creating Test Data
 # =============================================================================
@@ -79,13 +146,11 @@ def create_test_task(
     assignee_email: str = None
 ):
     """Helper function to create a test task in the database."""
-    from main import Task, TaskStatus, TaskPriority
-
-    task = Task(
+    task = main.Task(
         title=title,
         description=description,
-        status=status if isinstance(status, TaskStatus) else TaskStatus(status),
-        priority=priority if isinstance(priority, TaskPriority) else TaskPriority(priority),
+        status=status if isinstance(status, main.TaskStatus) else main.TaskStatus(status),
+        priority=priority if isinstance(priority, main.TaskPriority) else main.TaskPriority(priority),
         due_date=due_date,
         tags=tags,
         assignee_email=assignee_email
@@ -96,5 +161,30 @@ def create_test_task(
     return task
 
 
-# Export helper function
+def seed_tasks(session: Session, specs: list[dict]):
+    """
+    Helper function to insert many test tasks with a single commit.
+
+    Bypasses the HTTP layer - use it for setup data, not for testing creation.
+    """
+    tasks = [main.Task.model_validate(spec) for spec in specs]
+    session.add_all(tasks)
+    session.commit()
+    return tasks
+
+
+# Keys every task in an API response must have
+TASK_REQUIRED_KEYS = frozenset({"id", "title", "created_at", "updated_at"})
+
+
+def assert_task_shape(data: dict, **expected):
+    """Helper function to check a task response has the task keys and expected values."""
+    assert data.keys() >= TASK_REQUIRED_KEYS, TASK_REQUIRED_KEYS - data.keys()
+    for key, value in expected.items():
+        assert data[key] == value, (key, data[key], value)
+
+
+# Export helper functions
 pytest.create_test_task = create_test_task
+pytest.seed_tasks = seed_tasks
+pytest.assert_task_shape = assert_task_shape
@@ -11,20 +11,27 @@ Features:
 """
 
 from fastapi import FastAPI, Depends, HTTPException, Query
-from sqlmodel import SQLModel, Field, Session, create_engine, select
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
+from sqlmodel import SQLModel, Field, Session, select
 from sqlmodel import col
+from sqlmodel.sql.sqltypes import AutoString
+from sqlalchemy import Column, DateTime, Index, Integer, bindparam, func, insert, update
+from sqlalchemy import type_coerce
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
 from typing import Optional, List
 from datetime import datetime
-from pydantic import EmailStr, BaseModel
+from functools import lru_cache
+from pydantic import BaseModel
 from enum import Enum
-from dotenv import load_dotenv
 
-import sys
-import os
+import orjson
+import time
 
 # from database import get_session, init_db
 from database import get_session
-from database import engine
 # =============================================================================
 # Enums for Status and Priority
 # =============================================================================
@@ -42,6 +49,89 @@ class TaskPriority(str, Enum):
     urgent = "urgent"
 
 
+# Enum members in definition order, captured once for the stats endpoint
+_STATUSES = tuple(TaskStatus)
+_PRIORITIES = tuple(TaskPriority)
+
+
+# =============================================================================
+# Portable SQL Functions
+# =============================================================================
+
+class utcnow(FunctionElement):
+    """
+    Current UTC time from the database, as a naive timestamp.
+
+    The timestamp columns have no time zone and are compared with
+    datetime.utcnow(). On Postgres, plain now() would be stored in the
+    session TimeZone, so it is converted to UTC explicitly.
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "sqlite")
+def _utcnow_sqlite(element, compiler, **kw):
+    # UTC like CURRENT_TIMESTAMP, but keeps milliseconds (padded to the
+    # microsecond format SQLAlchemy writes) instead of whole seconds
+    return "strftime('%Y-%m-%d %H:%M:%f', 'now') || '000'"
+
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element, compiler, **kw):
+    return "timezone('utc', now())"
+
+
+class instr(FunctionElement):
+    """
+    1-based position of a substring (0 if absent), case-sensitive everywhere.
+
+    Unlike LIKE, which ignores case on SQLite but not on Postgres.
+    """
+    type = Integer()
+    inherit_cache = True
+
+
+@compiles(instr)
+def _instr_default(element, compiler, **kw):
+    return "instr(%s)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(instr, "postgresql")
+def _instr_postgresql(element, compiler, **kw):
+    return "strpos(%s)" % compiler.process(element.clauses, **kw)
+
+
+# =============================================================================
+# Column Types
+# =============================================================================
+
+def _normalize_tags(tags: Optional[str]) -> Optional[str]:
+    """Strip the whitespace around each comma-separated tag and drop empty ones."""
+    if tags is None:
+        return None
+    return ",".join(tag.strip() for tag in tags.split(",") if tag.strip())
+
+
+class TagList(TypeDecorator):
+    """
+    Comma-separated tags, stored as "a,b,c" whatever spacing was written.
+
+    Applied to every write (ORM and Core INSERT/UPDATE), so a tag lookup
+    can match ",tag," exactly.
+    """
+    impl = AutoString
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return _normalize_tags(value)
+
+
 # =============================================================================
 # Single Model for both DB and API - SQLModel
 # =============================================================================
@@ -51,6 +141,11 @@ class Task(SQLModel, table=True):
     Task model - Single model for both database and API.
     SQLModel combines Pydantic (for validation) and SQLAlchemy (for database).
     """
+    # Composite index for the "completed this week" stats query
+    __table_args__ = (
+        Index("ix_task_status_updated_at", "status", "updated_at"),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
 
     # # Title is required and indexed
@@ -59,10 +154,9 @@ class Task(SQLModel, table=True):
     # Optional description
     description: Optional[str] = Field(default=None, max_length=2000)
 
-    # Status with default and index for filtering
+    # Status with default; filtering uses the (status, updated_at) index
     status: TaskStatus = Field(
-        default=TaskStatus.todo,
-        index=True
+        default=TaskStatus.todo
     )
 
     # Priority level
@@ -71,18 +165,26 @@ class Task(SQLModel, table=True):
         index=True
     )
 
-    # Due date (optional)
-    due_date: Optional[datetime] = None
+    # Due date (optional), indexed for the overdue stats query
+    due_date: Optional[datetime] = Field(default=None, index=True)
 
     # Tags stored as comma-separated string (SQLite doesn't have native array type)
-    tags: Optional[str] = Field(default=None)
+    tags: Optional[str] = Field(default=None, sa_type=TagList)
 
     # Assignee email with validation
     assignee_email: Optional[str] = Field(default=None, index=True)
 
-    # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Timestamps, stamped (in UTC) by the database on INSERT / UPDATE
+    created_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime, server_default=utcnow(), nullable=False)
+    )
+    updated_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(
+            DateTime, server_default=utcnow(), onupdate=utcnow(), nullable=False
+        )
+    )
 
 # create_table()
 # =============================================================================
@@ -130,29 +232,22 @@ class ApiInfoResponse(BaseModel):
 
 
 # =============================================================================
-# Database Table Creation Function
+# Stats Cache
 # =============================================================================
 
-def create_tables():
-    """
-    Database mein SQLModel ke liye table create karta hai.
-
-    Yeh function SQLModel metadata use karke sabhi models ke liye
-    tables automatically create kar deta hai. Agar tables pehle se
-    exist karti hain toh unhe skip kar deta hai (safe operation).
+# How long cached stats may be served; bounds staleness across worker processes
+# and for the time-based counters (overdue, completed this week)
+STATS_CACHE_TTL_SECONDS = 5.0
 
-    Returns:
-        None: Tables database mein create ho jati hain
-    """
-    # from database import engine
+# Bumped by every write endpoint; cached stats are only valid for one generation
+_tasks_generation = 0
+_stats_cache = {"generation": -1, "expires_at": 0.0, "value": None}
 
-    # SQLModel metadata se sabhi tables create karein
-    SQLModel.metadata.create_all(engine)
-    print("table has been created")
 
-    print("Database tables successfully created!")
-    print("- Task table created with all fields")
-    print("- Fields: id, title, description, status, priority, due_date, tags, assignee_email, created_at, updated_at")
+def invalidate_stats_cache():
+    """Mark cached task statistics as stale after tasks change."""
+    global _tasks_generation
+    _tasks_generation += 1
 
 
 # =============================================================================
@@ -162,48 +257,51 @@ def create_tables():
 app = FastAPI(
     title="Task Management API",
     description="Complete CRUD API for task management using FastAPI and SQLModel",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson encodes datetimes and enums natively, straight to bytes
+    default_response_class=ORJSONResponse
 )
 
-
-# Initialize database on startup
-@app.on_event("startup")
-def on_startup():
-    """Server start hone par tables create karein."""
-    create_tables()
+# Compress larger bodies (task lists) for clients that send Accept-Encoding: gzip
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 
 # =============================================================================
 # Root & Health Endpoints
 # =============================================================================
 
+# Fixed bodies, serialized once at import instead of on every request
+_ROOT_BODY = orjson.dumps({
+    "name": "Task Management API",
+    "version": "1.0.0",
+    "docs": "/docs",
+    "endpoints": [
+        "GET / - API information",
+        "GET /health - Health check",
+        "GET /tasks/ - List all tasks (with pagination & filters)",
+        "POST /tasks/ - Create a new task",
+        "GET /tasks/{id} - Get task by ID",
+        "PATCH /tasks/{id} - Update task (partial)",
+        "DELETE /tasks/{id} - Delete task",
+        "GET /tasks/stats - Task statistics",
+    ]
+})
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "service": "task-management-api"
+})
+
+
 @app.get("/", response_model=ApiInfoResponse)
 def root():
     """Root endpoint with API information."""
-    return {
-        "name": "Task Management API",
-        "version": "1.0.0",
-        "docs": "/docs",
-        "endpoints": [
-            "GET / - API information",
-            "GET /health - Health check",
-            "GET /tasks/ - List all tasks (with pagination & filters)",
-            "POST /tasks/ - Create a new task",
-            "GET /tasks/{id} - Get task by ID",
-            "PATCH /tasks/{id} - Update task (partial)",
-            "DELETE /tasks/{id} - Delete task",
-            "GET /tasks/stats - Task statistics",
-        ]
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 @app.get("/health")
 def health_check():
     """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "service": "task-management-api"
-    }
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 # =============================================================================
@@ -211,7 +309,7 @@ def health_check():
 # =============================================================================
 
 # CREATE - Create a new task
-@app.post("/tasks")
+@app.post("/tasks/", response_model=Task, status_code=201)
 def create_task(
     task: Task,
     session: Session = Depends(get_session)
@@ -222,14 +320,54 @@ def create_task(
     Uses:
     - Task model (SQLModel) for both validation and database
     - Session from Depends(get_session) for database access
-    - session.add() to insert the task
+    - insert().returning() to insert the task and get it back with its ID
+      in one round-trip (no ORM flush, no refresh SELECT)
     - session.commit() to persist changes
-    - session.refresh() to get the generated ID
     """
-    session.add(task)
+    # The id and timestamps come from the database. Table models skip
+    # validation, so enums can arrive as their plain string values -
+    # SQLAlchemy's Enum type accepts those, no need to warn about it
+    values = task.model_dump(
+        exclude={"id", "created_at", "updated_at"}, warnings=False
+    )
+    statement = insert(Task).values(**values).returning(Task)
+    created = session.exec(statement).scalar_one()
+
+    # Detach so the commit doesn't expire the values RETURNING just gave us
+    session.expunge(created)
     session.commit()
-    session.refresh(task)
-    return task
+    invalidate_stats_cache()
+    return created
+
+
+@lru_cache(maxsize=16)
+def _list_statements(active_filters: frozenset):
+    """
+    Build the page and count SELECTs for one combination of list filters.
+
+    Filter values, skip and limit are bound parameters, so each of the 16
+    combinations is constructed once and reused with that request's values.
+    """
+    filters = []
+    if "status" in active_filters:
+        filters.append(Task.status == bindparam("status"))
+    if "priority" in active_filters:
+        filters.append(Task.priority == bindparam("priority"))
+    if "assignee_email" in active_filters:
+        filters.append(Task.assignee_email == bindparam("assignee_email"))
+    if "search" in active_filters:
+        filters.append(
+            (col(Task.title).icontains(bindparam("search"))) |
+            (col(Task.description).icontains(bindparam("search")))
+        )
+
+    page_statement = (
+        select(Task).where(*filters)
+        .offset(bindparam("skip"))
+        .limit(bindparam("limit"))
+    )
+    count_statement = select(func.count()).select_from(Task).where(*filters)
+    return page_statement, count_statement
 
 
 # READ - List all tasks with pagination and filtering
@@ -247,52 +385,34 @@ def list_tasks(
     List all tasks with pagination and filtering.
 
     Uses:
-    - select() to build queries
+    - select() to build queries, cached per filter combination
     - col() for case-insensitive search
     - where() for filtering
+    - func.count() to count matches in the database
     - offset() and limit() for pagination
-    - session.exec() to execute the query
+    - session.exec() to execute the query with bound parameters
     """
-    # Start building the query
-    statement = select(Task)
-
-    # Apply filters
-    if status:
-        statement = statement.where(Task.status == status)
-    if priority:
-        statement = statement.where(Task.priority == priority)
-    if assignee_email:
-        statement = statement.where(Task.assignee_email == assignee_email)
-    if search:
-        statement = statement.where(
-            (col(Task.title).icontains(search)) |
-            (col(Task.description).icontains(search))
-        )
-
-    # Get total count before pagination
-    count_statement = select(Task)
-    if status:
-        count_statement = count_statement.where(Task.status == status)
-    if priority:
-        count_statement = count_statement.where(Task.priority == priority)
-    if assignee_email:
-        count_statement = count_statement.where(Task.assignee_email == assignee_email)
-    if search:
-        count_statement = count_statement.where(
-            (col(Task.title).icontains(search)) |
-            (col(Task.description).icontains(search))
-        )
+    # Only the filters that were given take part in the query
+    params = {
+        "status": status,
+        "priority": priority,
+        "assignee_email": assignee_email,
+        "search": search,
+    }
+    params = {name: value for name, value in params.items() if value}
+    page_statement, count_statement = _list_statements(frozenset(params))
 
-    total = len(session.exec(count_statement).all())
+    # Get total count before pagination - counted by the database, not in Python
+    total = session.exec(count_statement, params=params).one()
 
-    # Apply pagination
-    statement = statement.offset(skip).limit(limit)
-    tasks = session.exec(statement).all()
+    # Fetch the requested page
+    tasks = session.exec(page_statement, params={**params, "skip": skip, "limit": limit}).all()
 
     # Calculate page number
     page = (skip // limit) + 1
 
-    return TaskListResponse(
+    # Trusted data fresh from the database - skip re-validating every task
+    return TaskListResponse.model_construct(
         tasks=tasks,
         total=total,
         page=page,
@@ -306,34 +426,56 @@ def list_tasks(
 
 @app.get("/tasks/stats", response_model=TaskStatsResponse)
 def get_task_stats(session: Session = Depends(get_session)):
-    """Get task statistics."""
-    all_tasks = session.exec(select(Task)).all()
+    """Get task statistics (cached until tasks change or the TTL expires)."""
+    # Read the generation before computing, so a concurrent write marks this result stale
+    generation = _tasks_generation
+    now_monotonic = time.monotonic()
+    if _stats_cache["generation"] == generation and now_monotonic < _stats_cache["expires_at"]:
+        return _stats_cache["value"]
 
-    by_status = {}
-    by_priority = {}
+    # Aggregate in the database instead of loading every task
+    total = session.exec(select(func.count()).select_from(Task)).one()
 
-    for status in TaskStatus:
-        by_status[status.value] = sum(1 for t in all_tasks if t.status == status)
+    status_counts = dict(session.exec(select(Task.status, func.count()).group_by(Task.status)).all())
+    priority_counts = dict(session.exec(select(Task.priority, func.count()).group_by(Task.priority)).all())
 
-    for priority in TaskPriority:
-        by_priority[priority.value] = sum(1 for t in all_tasks if t.priority == priority)
+    # Statuses/priorities with no tasks are reported as 0
+    by_status = {status.value: status_counts.get(status, 0) for status in _STATUSES}
+    by_priority = {priority.value: priority_counts.get(priority, 0) for priority in _PRIORITIES}
 
     # Count overdue tasks
     now = datetime.utcnow()
-    overdue = sum(1 for t in all_tasks if t.due_date and t.due_date < now and t.status != TaskStatus.done)
+    overdue = session.exec(
+        select(func.count()).select_from(Task).where(
+            Task.due_date < now,
+            Task.status != TaskStatus.done
+        )
+    ).one()
 
     # Count completed this week
     week_ago = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    completed_this_week = sum(1 for t in all_tasks if t.status == TaskStatus.done and t.updated_at >= week_ago)
+    completed_this_week = session.exec(
+        select(func.count()).select_from(Task).where(
+            Task.status == TaskStatus.done,
+            Task.updated_at >= week_ago
+        )
+    ).one()
 
-    return TaskStatsResponse(
-        total=len(all_tasks),
+    stats = TaskStatsResponse.model_construct(
+        total=total,
         by_status=by_status,
         by_priority=by_priority,
         overdue=overdue,
         completed_this_week=completed_this_week
     )
 
+    _stats_cache.update(
+        generation=generation,
+        expires_at=now_monotonic + STATS_CACHE_TTL_SECONDS,
+        value=stats
+    )
+    return stats
+
 
 @app.get("/tasks/by-tag/{tag}", response_model=List[Task])
 def get_tasks_by_tag(
@@ -341,9 +483,13 @@ def get_tasks_by_tag(
     session: Session = Depends(get_session)
 ):
     """Get all tasks with a specific tag."""
-    # Note: This is a simple implementation. For production, you'd want proper JSON querying
-    all_tasks = session.exec(select(Task)).all()
-    return [t for t in all_tasks if tag in (t.tags or "")]
+    # Tags are stored normalized ("a,b,c"): wrap them in commas and look for ",tag,"
+    # so "cat" doesn't match "category". The column is read as plain text so the ","
+    # literals skip TagList's normalization. instr() is a plain substring search, not
+    # LIKE - no wildcards, same case rules on every database.
+    tag_list = "," + type_coerce(col(Task.tags), AutoString) + ","
+    statement = select(Task).where(instr(tag_list, f",{tag.strip()},") > 0)
+    return session.exec(statement).all()
 
 
 @app.get("/tasks/assignee/{email}", response_model=List[Task])
@@ -390,28 +536,30 @@ def update_task(
     Update a task (partial update).
 
     Uses:
-    - session.get() to fetch existing task
     - model_dump() to get update data
-    - setattr() to update fields dynamically
     - exclude_unset=True to only update provided fields
+    - update().returning() to apply them and get the task back in a single
+      UPDATE ... RETURNING - no fetch before, no refresh after
     """
-    task = session.get(Task, task_id)
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-
     # Get update data (only fields that were set)
     update_data = task_update.model_dump(exclude_unset=True)
 
-    # Update fields
-    for field, value in update_data.items():
-        setattr(task, field, value)
-
-    # Update the updated_at timestamp
-    task.updated_at = datetime.utcnow()
+    # Setting updated_at explicitly keeps an empty PATCH a valid UPDATE
+    statement = (
+        update(Task)
+        .where(Task.id == task_id)
+        .values(**update_data, updated_at=utcnow())
+        .returning(Task)
+        .execution_options(populate_existing=True)
+    )
+    task = session.exec(statement).scalar_one_or_none()
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
 
-    session.add(task)
+    # Detach so the commit doesn't expire the values RETURNING just gave us
+    session.expunge(task)
     session.commit()
-    session.refresh(task)
+    invalidate_stats_cache()
     return task
 
 
@@ -422,17 +570,26 @@ def update_task_status(
     new_status: TaskStatus = Query(..., description="New status"),
     session: Session = Depends(get_session)
 ):
-    """Quick endpoint to update only the task status."""
-    task = session.get(Task, task_id)
+    """
+    Quick endpoint to update only the task status.
+
+    A single UPDATE ... RETURNING - no separate fetch before or after.
+    """
+    statement = (
+        update(Task)
+        .where(Task.id == task_id)
+        .values(status=new_status)
+        .returning(Task)
+        .execution_options(populate_existing=True)
+    )
+    task = session.exec(statement).scalar_one_or_none()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    task.status = new_status
-    task.updated_at = datetime.utcnow()
-
-    session.add(task)
+    # Detach so the commit doesn't expire the values RETURNING just gave us
+    session.expunge(task)
     session.commit()
-    session.refresh(task)
+    invalidate_stats_cache()
     return task
 
 
@@ -456,4 +613,5 @@ def delete_task(
 
     session.delete(task)
     session.commit()
+    invalidate_stats_cache()
     return None
@@ -0,0 +1,56 @@
+"""create task table
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-15 07:51:25.723285
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases from before migrations already have the table (the app used
+    # to run create_all on startup) - leave those as they are
+    if not context.is_offline_mode() and sa.inspect(op.get_bind()).has_table('task'):
+        return
+
+    # The schema create_all produced at that point; later revisions build on it
+    op.create_table('task',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('description', sqlmodel.sql.sqltypes.AutoString(length=2000), nullable=True),
+    sa.Column('status', sa.Enum('todo', 'in_progress', 'done', name='taskstatus'), nullable=False),
+    sa.Column('priority', sa.Enum('low', 'medium', 'high', 'urgent', name='taskpriority'), nullable=False),
+    sa.Column('due_date', sa.DateTime(), nullable=True),
+    sa.Column('tags', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('assignee_email', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_task_assignee_email'), ['assignee_email'], unique=False)
+        batch_op.create_index(batch_op.f('ix_task_priority'), ['priority'], unique=False)
+        batch_op.create_index(batch_op.f('ix_task_status'), ['status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_task_status'))
+        batch_op.drop_index(batch_op.f('ix_task_priority'))
+        batch_op.drop_index(batch_op.f('ix_task_assignee_email'))
+
+    op.drop_table('task')
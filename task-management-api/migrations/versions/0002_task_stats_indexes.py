@@ -0,0 +1,47 @@
+"""task stats indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15 08:10:12.418093
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _index_names() -> set:
+    # Offline (--sql) runs have no database to inspect: assume the 0001 schema
+    if context.is_offline_mode():
+        return {'ix_task_status'}
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes('task')}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Tables created by create_all after these indexes were added to the
+    # model already have them, so only touch what is missing
+    existing = _index_names()
+    if 'ix_task_due_date' not in existing:
+        op.create_index('ix_task_due_date', 'task', ['due_date'], unique=False)
+    if 'ix_task_status_updated_at' not in existing:
+        op.create_index('ix_task_status_updated_at', 'task', ['status', 'updated_at'], unique=False)
+    # status leads the composite index, so its own index is redundant
+    if 'ix_task_status' in existing:
+        op.drop_index('ix_task_status', table_name='task')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_task_status', 'task', ['status'], unique=False)
+    op.drop_index('ix_task_status_updated_at', table_name='task')
+    op.drop_index('ix_task_due_date', table_name='task')
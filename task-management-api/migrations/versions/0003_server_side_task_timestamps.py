@@ -0,0 +1,50 @@
+"""server side task timestamps
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-15 07:52:41.780485
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _utc_now():
+    # Same as main.utcnow: Postgres' now() follows the session TimeZone,
+    # SQLite's CURRENT_TIMESTAMP drops to whole seconds
+    dialect = context.get_context().dialect.name
+    if dialect == 'postgresql':
+        return sa.text("timezone('utc', now())")
+    if dialect == 'sqlite':
+        return sa.text("(strftime('%Y-%m-%d %H:%M:%f', 'now') || '000')")
+    return sa.text('CURRENT_TIMESTAMP')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # updated_at is bumped by the UPDATE statements themselves (onupdate on
+    # the model), so only the INSERT defaults live in the schema
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(),
+                              existing_nullable=False, server_default=_utc_now())
+        batch_op.alter_column('updated_at', existing_type=sa.DateTime(),
+                              existing_nullable=False, server_default=_utc_now())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.alter_column('updated_at', existing_type=sa.DateTime(),
+                              existing_nullable=False, server_default=None)
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(),
+                              existing_nullable=False, server_default=None)
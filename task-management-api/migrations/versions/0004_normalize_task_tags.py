@@ -0,0 +1,42 @@
+"""normalize task tags
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-15 08:21:47.305112
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+task = sa.table('task', sa.column('id', sa.Integer), sa.column('tags', sa.String))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The app now stores tags as "a,b,c"; bring rows written before that in line
+    # (same rule as main.TagList). Offline (--sql) runs assume a fresh database.
+    if context.is_offline_mode():
+        return
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(task.c.id, task.c.tags).where(task.c.tags.isnot(None))).all()
+    for task_id, tags in rows:
+        normalized = ",".join(tag.strip() for tag in tags.split(",") if tag.strip())
+        if normalized != tags:
+            bind.execute(task.update().where(task.c.id == task_id).values(tags=normalized))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The original spacing is not kept - nothing to restore
+    pass
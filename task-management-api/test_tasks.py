@@ -9,8 +9,11 @@ Tests cover:
 - Edge cases and error handling
 """
 from datetime import datetime, timedelta
+import json
 import pytest
 from fastapi.testclient import TestClient
+from httpx import AsyncClient
+from sqlalchemy import text
 
 
 # =============================================================================
@@ -26,6 +29,10 @@ SAMPLE_TASK = {
     "assignee_email": "john@example.com"
 }
 
+# Pre-serialized request body, so the client doesn't re-encode it per request
+SAMPLE_TASK_BYTES = json.dumps(SAMPLE_TASK).encode()
+_JSON_HDRS = {"content-type": "application/json"}
+
 
 # =============================================================================
 # Health Check Tests
@@ -61,26 +68,16 @@ def test_create_task_minimal(test_client: TestClient):
 
     assert response.status_code == 201
     data = response.json()
-    assert data["title"] == "Simple task"
-    assert data["status"] == "todo"
-    assert data["priority"] == "medium"
+    pytest.assert_task_shape(data, title="Simple task", status="todo", priority="medium")
     assert data["id"] > 0
-    assert "created_at" in data
-    assert "updated_at" in data
 
 
 def test_create_task_full(test_client: TestClient):
     """Test creating a task with all fields."""
-    response = test_client.post("/tasks/", json=SAMPLE_TASK)
+    response = test_client.post("/tasks/", content=SAMPLE_TASK_BYTES, headers=_JSON_HDRS)
 
     assert response.status_code == 201
-    data = response.json()
-    assert data["title"] == SAMPLE_TASK["title"]
-    assert data["description"] == SAMPLE_TASK["description"]
-    assert data["status"] == SAMPLE_TASK["status"]
-    assert data["priority"] == SAMPLE_TASK["priority"]
-    assert data["tags"] == SAMPLE_TASK["tags"]
-    assert data["assignee_email"] == SAMPLE_TASK["assignee_email"]
+    pytest.assert_task_shape(response.json(), **SAMPLE_TASK)
 
 
 @pytest.mark.skip(reason="SQLModel datetime parsing issue with ISO strings")
@@ -137,11 +134,10 @@ def test_list_tasks_empty(test_client: TestClient):
     assert data["page_size"] == 10
 
 
-def test_list_tasks_with_data(test_client: TestClient):
+def test_list_tasks_with_data(test_client: TestClient, test_session):
     """Test listing tasks with multiple tasks in database."""
     # Create multiple tasks
-    for i in range(3):
-        test_client.post("/tasks/", json={"title": f"Task {i}"})
+    pytest.seed_tasks(test_session, [{"title": f"Task {i}"} for i in range(3)])
 
     response = test_client.get("/tasks/")
 
@@ -151,11 +147,10 @@ def test_list_tasks_with_data(test_client: TestClient):
     assert data["total"] == 3
 
 
-def test_list_tasks_pagination(test_client: TestClient):
+def test_list_tasks_pagination(test_client: TestClient, test_session):
     """Test pagination of task list."""
     # Create 15 tasks
-    for i in range(15):
-        test_client.post("/tasks/", json={"title": f"Task {i}"})
+    pytest.seed_tasks(test_session, [{"title": f"Task {i}"} for i in range(15)])
 
     # Get first page
     response = test_client.get("/tasks/?skip=0&limit=10")
@@ -171,66 +166,139 @@ def test_list_tasks_pagination(test_client: TestClient):
     assert data["page"] == 2
 
 
-def test_list_tasks_filter_by_status(test_client: TestClient):
-    """Test filtering tasks by status."""
-    # Create tasks with different statuses
-    test_client.post("/tasks/", json={"title": "Todo Task", "status": "todo"})
-    test_client.post("/tasks/", json={"title": "Done Task", "status": "done"})
-    test_client.post("/tasks/", json={"title": "Another Done Task", "status": "done"})
-
-    response = test_client.get("/tasks/?status=done")
+@pytest.mark.parametrize("seed, url, expected_count, field, expected_values", [
+    pytest.param(
+        [
+            {"title": "Todo Task", "status": "todo"},
+            {"title": "Done Task", "status": "done"},
+            {"title": "Another Done Task", "status": "done"},
+        ],
+        "/tasks/?status=done", 2, "status", {"done"},
+        id="status",
+    ),
+    pytest.param(
+        [
+            {"title": "High Task", "priority": "high"},
+            {"title": "Low Task", "priority": "low"},
+        ],
+        "/tasks/?priority=high", 1, "priority", {"high"},
+        id="priority",
+    ),
+    pytest.param(
+        [
+            {"title": "Python programming task", "description": "Learn Python"},
+            {"title": "Java task", "description": "Learn Java"},
+        ],
+        "/tasks/?search=Python", 1, "title", {"Python programming task"},
+        id="search",
+    ),
+    pytest.param(
+        [
+            {"title": "Task 1", "assignee_email": "user1@example.com"},
+            {"title": "Task 2", "assignee_email": "user2@example.com"},
+        ],
+        "/tasks/?assignee_email=user1@example.com", 1,
+        "assignee_email", {"user1@example.com"},
+        id="assignee_email",
+    ),
+    pytest.param(
+        [
+            {"title": "Python Task", "tags": "python,programming"},
+            {"title": "Java Task", "tags": "java,programming"},
+        ],
+        "/tasks/by-tag/python", 1, "title", {"Python Task"},
+        id="by-tag",
+    ),
+    pytest.param(
+        [
+            {"title": "Cat Task", "tags": "pets, cat"},
+            {"title": "Category Task", "tags": "category,cats"},
+            {"title": "Untagged Task"},
+        ],
+        "/tasks/by-tag/cat", 1, "title", {"Cat Task"},
+        id="by-tag-whole-tag-only",
+    ),
+    pytest.param(
+        [
+            {"title": "Double Space Task", "tags": "pets,  cat"},
+            {"title": "Space Before Task", "tags": "cat ,x"},
+            {"title": "Leading Space Task", "tags": " cat"},
+            {"title": "Inner Space Task", "tags": "cat food"},
+        ],
+        "/tasks/by-tag/cat", 3, "title",
+        {"Double Space Task", "Space Before Task", "Leading Space Task"},
+        id="by-tag-irregular-spacing",
+    ),
+    pytest.param(
+        [
+            {"title": "Lower Task", "tags": "urgent,cat"},
+            {"title": "Upper Task", "tags": "CAT"},
+        ],
+        "/tasks/by-tag/CAT", 1, "title", {"Upper Task"},
+        id="by-tag-case-sensitive",
+    ),
+    pytest.param(
+        [
+            {"title": "Percent Task", "tags": "100%"},
+            {"title": "Other Task", "tags": "1000"},
+        ],
+        "/tasks/by-tag/100%25", 1, "title", {"Percent Task"},
+        id="by-tag-no-wildcards",
+    ),
+    pytest.param(
+        [
+            {"title": "Task 1", "assignee_email": "john@example.com"},
+            {"title": "Task 2", "assignee_email": "jane@example.com"},
+            {"title": "Task 3", "assignee_email": "john@example.com"},
+        ],
+        "/tasks/assignee/john@example.com", 2,
+        "assignee_email", {"john@example.com"},
+        id="by-assignee",
+    ),
+])
+async def test_list_tasks_filters(
+    async_client: AsyncClient, test_session, seed, url, expected_count, field, expected_values
+):
+    """Test filtering and searching tasks via query params and filter endpoints."""
+    pytest.seed_tasks(test_session, seed)
+
+    response = await async_client.get(url)
+    assert response.status_code == 200
     data = response.json()
 
-    assert len(data["tasks"]) == 2
-    assert all(task["status"] == "done" for task in data["tasks"])
-
-
-def test_list_tasks_filter_by_priority(test_client: TestClient):
-    """Test filtering tasks by priority."""
-    test_client.post("/tasks/", json={"title": "High Task", "priority": "high"})
-    test_client.post("/tasks/", json={"title": "Low Task", "priority": "low"})
-
-    response = test_client.get("/tasks/?priority=high")
+    # /tasks/ returns a paginated envelope, the filter endpoints a plain list
+    tasks = data["tasks"] if isinstance(data, dict) else data
+    assert len(tasks) == expected_count
+    assert {task[field] for task in tasks} == expected_values
+
+
+async def test_list_tasks_combined_filters(async_client: AsyncClient, test_session):
+    """Test several filters together with pagination, reusing the cached query for new values."""
+    pytest.seed_tasks(test_session, [
+        {"title": "Python API", "status": "done", "priority": "high"},
+        {"title": "Python docs", "status": "done", "priority": "high"},
+        {"title": "Numpy upgrade", "status": "done", "priority": "high"},
+        {"title": "Python tests", "status": "todo", "priority": "high"},
+        {"title": "Python lint", "status": "done", "priority": "low"},
+        {"title": "Java API", "status": "done", "priority": "high"},
+    ])
+
+    response = await async_client.get(
+        "/tasks/?status=done&priority=high&search=py&skip=1&limit=2"
+    )
     data = response.json()
+    assert data["total"] == 3
+    assert data["page"] == 1
+    assert len(data["tasks"]) == 2
+    assert all(
+        task["status"] == "done" and task["priority"] == "high" for task in data["tasks"]
+    )
 
-    assert len(data["tasks"]) == 1
-    assert data["tasks"][0]["priority"] == "high"
-
-
-def test_list_tasks_search(test_client: TestClient):
-    """Test searching tasks by title and description."""
-    test_client.post("/tasks/", json={
-        "title": "Python programming task",
-        "description": "Learn Python"
-    })
-    test_client.post("/tasks/", json={
-        "title": "Java task",
-        "description": "Learn Java"
-    })
-
-    response = test_client.get("/tasks/?search=Python")
-    data = response.json()
-
-    assert len(data["tasks"]) == 1
-    assert "Python" in data["tasks"][0]["title"]
-
-
-def test_list_tasks_filter_by_assignee(test_client: TestClient):
-    """Test filtering tasks by assignee email."""
-    test_client.post("/tasks/", json={
-        "title": "Task 1",
-        "assignee_email": "user1@example.com"
-    })
-    test_client.post("/tasks/", json={
-        "title": "Task 2",
-        "assignee_email": "user2@example.com"
-    })
-
-    response = test_client.get("/tasks/?assignee_email=user1@example.com")
+    # Same filter combination, different values
+    response = await async_client.get("/tasks/?status=todo&priority=high&search=py")
     data = response.json()
-
-    assert len(data["tasks"]) == 1
-    assert data["tasks"][0]["assignee_email"] == "user1@example.com"
+    assert data["total"] == 1
+    assert [task["title"] for task in data["tasks"]] == ["Python tests"]
 
 
 # =============================================================================
@@ -276,11 +344,7 @@ def test_update_task_full(test_client: TestClient):
     response = test_client.patch(f"/tasks/{task_id}", json=update_data)
 
     assert response.status_code == 200
-    data = response.json()
-    assert data["title"] == "Updated Title"
-    assert data["description"] == "Updated description"
-    assert data["status"] == "in_progress"
-    assert data["priority"] == "urgent"
+    pytest.assert_task_shape(response.json(), **update_data)
 
 
 def test_update_task_partial(test_client: TestClient):
@@ -370,12 +434,14 @@ def test_task_stats_empty(test_client: TestClient):
     assert data["completed_this_week"] == 0
 
 
-def test_task_stats_with_data(test_client: TestClient):
+def test_task_stats_with_data(test_client: TestClient, test_session):
     """Test statistics endpoint with multiple tasks."""
     # Create tasks with different statuses and priorities
-    test_client.post("/tasks/", json={"title": "Task 1", "status": "todo", "priority": "high"})
-    test_client.post("/tasks/", json={"title": "Task 2", "status": "done", "priority": "low"})
-    test_client.post("/tasks/", json={"title": "Task 3", "status": "todo", "priority": "high"})
+    pytest.seed_tasks(test_session, [
+        {"title": "Task 1", "status": "todo", "priority": "high"},
+        {"title": "Task 2", "status": "done", "priority": "low"},
+        {"title": "Task 3", "status": "todo", "priority": "high"},
+    ])
 
     response = test_client.get("/tasks/stats")
 
@@ -388,48 +454,62 @@ def test_task_stats_with_data(test_client: TestClient):
     assert data["by_priority"]["low"] == 1
 
 
-# =============================================================================
-# Additional Endpoint Tests
-# =============================================================================
+def test_task_stats_overdue_and_completed(test_client: TestClient, test_session):
+    """Test the overdue and completed-this-week counters."""
+    yesterday = datetime.utcnow() - timedelta(days=1)
+    pytest.seed_tasks(test_session, [
+        {"title": "Overdue", "status": "todo", "due_date": yesterday},
+        {"title": "Done late", "status": "done", "due_date": yesterday},
+        {"title": "No deadline", "status": "in_progress"},
+        {"title": "Future", "status": "todo", "due_date": datetime.utcnow() + timedelta(days=7)},
+    ])
 
-def test_get_tasks_by_tag(test_client: TestClient):
-    """Test filtering tasks by tag."""
-    test_client.post("/tasks/", json={
-        "title": "Python Task",
-        "tags": "python,programming"
-    })
-    test_client.post("/tasks/", json={
-        "title": "Java Task",
-        "tags": "java,programming"
-    })
+    data = test_client.get("/tasks/stats").json()
 
-    response = test_client.get("/tasks/by-tag/python")
-    data = response.json()
+    assert data["overdue"] == 1
+    assert data["completed_this_week"] == 1
+    assert data["by_status"] == {"todo": 2, "in_progress": 1, "done": 1}
 
-    assert len(data) == 1
-    assert data[0]["title"] == "Python Task"
 
+def test_task_stats_refresh_after_write(test_client: TestClient, test_session):
+    """Test cached statistics are recomputed after a task changes."""
+    task = pytest.create_test_task(test_session, title="Task 1")
 
-def test_get_tasks_by_assignee(test_client: TestClient):
-    """Test getting all tasks for a specific assignee."""
-    test_client.post("/tasks/", json={
-        "title": "Task 1",
-        "assignee_email": "john@example.com"
-    })
-    test_client.post("/tasks/", json={
-        "title": "Task 2",
-        "assignee_email": "jane@example.com"
-    })
-    test_client.post("/tasks/", json={
-        "title": "Task 3",
-        "assignee_email": "john@example.com"
-    })
+    assert test_client.get("/tasks/stats").json()["total"] == 1
 
-    response = test_client.get("/tasks/assignee/john@example.com")
-    data = response.json()
+    test_client.delete(f"/tasks/{task.id}")
+
+    assert test_client.get("/tasks/stats").json()["total"] == 0
+
+
+def test_task_stats_refresh_after_helper_write(test_client: TestClient, test_session):
+    """Test tasks written straight to the database don't leave stats stale."""
+    assert test_client.get("/tasks/stats").json()["total"] == 0
+
+    pytest.create_test_task(test_session, title="Task 1")
+
+    assert test_client.get("/tasks/stats").json()["total"] == 1
+
+
+def test_timestamps_set_by_database(test_client: TestClient, test_session):
+    """Test created_at/updated_at are stamped on insert and bumped on every update."""
+    created = test_client.post("/tasks/", json={"title": "Stamped Task"}).json()
+    assert created["created_at"] is not None
+    assert created["updated_at"] == created["created_at"]
+    created_at = datetime.fromisoformat(created["created_at"])
 
-    assert len(data) == 2
-    assert all(task["assignee_email"] == "john@example.com" for task in data)
+    for url, kwargs in (
+        (f"/tasks/{created['id']}", {"json": {"title": "Renamed"}}),
+        (f"/tasks/{created['id']}/status", {"params": {"new_status": "done"}}),
+    ):
+        # Backdate the row so the bump is visible whatever the clock resolution
+        test_session.execute(
+            text("UPDATE task SET updated_at = '2000-01-01 00:00:00.000000' WHERE id = :id"),
+            {"id": created["id"]}
+        )
+        updated = test_client.patch(url, **kwargs).json()
+        assert updated["created_at"] == created["created_at"]
+        assert datetime.fromisoformat(updated["updated_at"]) >= created_at
 
 
 # =============================================================================